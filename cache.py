@@ -0,0 +1,88 @@
+"""
+Response Cache Helpers
+
+In-process TTL cache for read endpoints whose data changes slowly.
+The cached value is the already-encoded JSON body, so a hit skips the
+database and serialization entirely. Also a request coalescer for hot
+endpoints that are polled by many clients at once.
+"""
+
+import asyncio
+import functools
+import time
+
+import msgspec
+from fastapi import Response
+
+def ttl_cache(seconds: float):
+    """Cache a parameterless async endpoint's JSON body for `seconds`.
+
+    The wrapped endpoint may return a Response or any msgspec-serializable value.
+    Call ``endpoint.cache_clear()`` after writes to drop the cached body; reads
+    that started before the clear do not repopulate the cache.
+    """
+    def decorator(func):
+        entry = {}
+        state = {"generation": 0}
+
+        def lookup():
+            if entry and entry["expires"] > time.monotonic():
+                return Response(content=entry["body"], media_type="application/json")
+            return None
+
+        def store(result, generation):
+            if isinstance(result, Response):
+                if result.status_code != 200:
+                    return result
+                body = result.body
+            else:
+                body = msgspec.json.encode(result)
+            # A write cleared the cache while this read was running; its body may be stale
+            if generation == state["generation"]:
+                entry.update(body=body, expires=time.monotonic() + seconds)
+            return Response(content=body, media_type="application/json")
+
+        def cache_clear():
+            state["generation"] += 1
+            entry.clear()
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cached = lookup()
+            if cached is not None:
+                return cached
+            generation = state["generation"]
+            return store(await func(*args, **kwargs), generation)
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+def coalesce(window: float):
+    """Share one in-flight call of a parameterless async endpoint between callers.
+
+    Requests arriving while a call is running await the same result, and the
+    result is reused for `window` seconds after it completes. Failed calls are
+    not reused.
+    """
+    def decorator(func):
+        state = {}
+
+        def on_done(future):
+            if future.cancelled() or future.exception() is not None:
+                state.clear()
+            else:
+                state["expires"] = time.monotonic() + window
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            future = state.get("future")
+            if future is None or (future.done() and state["expires"] <= time.monotonic()):
+                future = asyncio.ensure_future(func(*args, **kwargs))
+                state.update(future=future, expires=float("inf"))
+                future.add_done_callback(on_done)
+            # Shield so one disconnecting client does not cancel the shared call
+            return await asyncio.shield(future)
+
+        return wrapper
+    return decorator
@@ -5,12 +5,13 @@ MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
 """
 
-from pymongo import MongoClient
-from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorClient
+from datetime import date, datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import List, Union
 from pydantic import BaseModel
+import msgspec
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,34 +23,103 @@ database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    _client = AsyncIOMotorClient(database_url)
     db = _client[database_name]
 
-# Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
-    """Insert a single document with timestamp"""
-    if db is None:
-        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+# Date-only fields per collection, stored as YYYY-MM-DD strings
+DATE_FIELDS = {
+    "policy": ["start_date", "end_date"],
+    "invoice": ["due_date"],
+    "renewal": ["renewal_date"],
+}
 
-    # Convert Pydantic model to dict if needed
+# Marker recorded once the stored date fields have been migrated
+_DATE_MIGRATION_ID = "date_fields_to_iso_strings"
+
+def _to_document(data: Union[BaseModel, msgspec.Struct, dict], now: datetime, date_fields: List[str] = ()) -> dict:
+    """Convert a model or dict to a Mongo document with created/updated timestamps"""
+    # Convert Pydantic model or msgspec Struct to dict if needed
     if isinstance(data, BaseModel):
         data_dict = data.model_dump()
+    elif isinstance(data, msgspec.Struct):
+        data_dict = msgspec.structs.asdict(data)
     else:
         data_dict = data.copy()
 
-    data_dict['created_at'] = datetime.now(timezone.utc)
-    data_dict['updated_at'] = datetime.now(timezone.utc)
+    # BSON has no date-only type; store calendar dates as YYYY-MM-DD strings
+    for key, value in data_dict.items():
+        if isinstance(value, datetime):
+            if key in date_fields:
+                data_dict[key] = value.date().isoformat()
+        elif isinstance(value, date):
+            data_dict[key] = value.isoformat()
+
+    data_dict['created_at'] = now
+    data_dict['updated_at'] = now
+    return data_dict
 
-    result = db[collection_name].insert_one(data_dict)
+# Helper functions for common database operations
+async def create_document(collection_name: str, data: Union[BaseModel, msgspec.Struct, dict]):
+    """Insert a single document with timestamp"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    data_dict = _to_document(data, datetime.now(timezone.utc), DATE_FIELDS.get(collection_name, ()))
+    result = await db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+async def create_documents(collection_name: str, items: List[Union[BaseModel, msgspec.Struct, dict]]):
+    """Insert several documents with timestamps in a single round-trip"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    now = datetime.now(timezone.utc)
+    date_fields = DATE_FIELDS.get(collection_name, ())
+    docs = [_to_document(data, now, date_fields) for data in items]
+    result = await db[collection_name].insert_many(docs, ordered=False)
+    return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None):
+    """Get documents from collection, optionally restricted to the projected fields"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = db[collection_name].find(filter_dict or {}, projection)
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return await cursor.to_list(length=None)
+
+def iter_documents(collection_name: str, filter_dict: dict = None, projection: dict = None):
+    """Return a lazy async cursor over documents, for streaming large collections"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    return db[collection_name].find(filter_dict or {}, projection)
+
+async def migrate_date_fields() -> bool:
+    """One-off rewrite of DATE_FIELDS stored as BSON datetimes to YYYY-MM-DD strings.
+
+    Records a marker in the "migrations" collection so later starts skip the
+    scans. Returns True if the migration ran.
+    """
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    if await db["migrations"].find_one({"_id": _DATE_MIGRATION_ID}) is not None:
+        return False
+
+    for collection_name, fields in DATE_FIELDS.items():
+        for field in fields:
+            await db[collection_name].update_many(
+                {field: {"$type": "date"}},
+                [{"$set": {field: {"$dateToString": {"format": "%Y-%m-%d", "date": f"${field}"}}}}],
+            )
+
+    # Idempotent, so a concurrent worker finishing first is harmless
+    await db["migrations"].update_one(
+        {"_id": _DATE_MIGRATION_ID},
+        {"$setOnInsert": {"applied_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+    return True
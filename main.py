@@ -1,66 +1,193 @@
 import os
-from fastapi import FastAPI, UploadFile, File, Form
+import asyncio
+import logging
+import msgspec
+from fastapi import FastAPI, UploadFile, File, Form, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 
-from database import db, create_document, get_documents
-from schemas import Policy, DocumentItem, Invoice, Renewal, Activity, Notification, Update, TeamMember
+from cache import coalesce, ttl_cache
+from database import db, create_document, create_documents, get_documents, iter_documents, migrate_date_fields
+from schemas import Policy, DocumentItem, Invoice, Renewal, Notification, Update, TeamMember, TeamMemberCreate
+from schemas_fast import PolicyS, DocumentItemS, InvoiceS, RenewalS, ActivityS, UpdateS, TeamMemberS
 
-app = FastAPI(title="Insurance Portal API")
+logger = logging.getLogger(__name__)
+
+# Seconds that slowly-changing list endpoints are served from memory
+LIST_CACHE_TTL = 30
+# Seconds a dashboard result is shared between concurrent pollers
+DASHBOARD_COALESCE_WINDOW = 0.1
+
+app = FastAPI(title="Insurance Portal API", default_response_class=ORJSONResponse)
+
+# Comma-separated list of allowed origins (defaults to the local frontend only).
+# Starlette checks `origin in allow_origins`, so pass a frozenset for O(1) lookups;
+# credentials are only enabled when no wildcard is used.
+FRONTEND_ORIGINS = frozenset(o.strip() for o in os.getenv("FRONTEND_ORIGIN", "http://localhost:3000").split(",") if o.strip())
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=FRONTEND_ORIGINS,
+    allow_credentials="*" not in FRONTEND_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Shared by every response body this module builds itself
+JSON_ENCODER = msgspec.json.Encoder()
+
+def struct_list_response(schema) -> Callable[[list], Response]:
+    """Build a responder that shapes raw Mongo documents into `schema` Structs and encodes them.
+
+    The ``List[schema]`` target type is resolved once here rather than on every
+    request. Unknown keys such as ``_id`` or ``created_at`` are dropped by the conversion.
+    """
+    list_type = List[schema]
+
+    def respond(docs: list) -> Response:
+        items = msgspec.convert(docs, list_type, strict=False)
+        return Response(content=JSON_ENCODER.encode(items), media_type="application/json")
+
+    return respond
+
+policies_response = struct_list_response(PolicyS)
+invoices_response = struct_list_response(InvoiceS)
+renewals_response = struct_list_response(RenewalS)
+updates_response = struct_list_response(UpdateS)
+team_response = struct_list_response(TeamMemberS)
+
+def projection_for(fields) -> dict:
+    """Mongo projection returning only the given schema fields, without ``_id``."""
+    return {"_id": 0, **dict.fromkeys(fields, 1)}
+
+POLICY_PROJECTION = projection_for(PolicyS.__struct_fields__)
+DOCUMENT_PROJECTION = projection_for(DocumentItemS.__struct_fields__)
+INVOICE_PROJECTION = projection_for(InvoiceS.__struct_fields__)
+RENEWAL_PROJECTION = projection_for(RenewalS.__struct_fields__)
+UPDATE_PROJECTION = projection_for(UpdateS.__struct_fields__)
+TEAM_PROJECTION = projection_for(TeamMemberS.__struct_fields__)
+ACTIVITY_PROJECTION = projection_for(ActivityS.__struct_fields__)
+
+async def stream_json_array(docs: AsyncIterator[dict], schema, first: Optional[dict] = None) -> AsyncIterator[bytes]:
+    """Encode documents one at a time as a JSON array, without materialising the list.
+
+    Each document is shaped through the `schema` Struct so missing fields get their
+    defaults. ``first`` is a document already pulled from ``docs`` by the caller.
+    """
+    def encode(doc: dict) -> bytes:
+        return JSON_ENCODER.encode(msgspec.convert(doc, schema, strict=False))
+
+    yield b"["
+    if first is not None:
+        yield encode(first)
+    sep = b"," if first is not None else b""
+    async for doc in docs:
+        yield sep + encode(doc)
+        sep = b","
+    yield b"]"
+
 @app.get("/")
 def read_root():
     return {"message": "Insurance Portal Backend Running"}
 
+# Demo records: seeded into empty collections and served, pre-encoded, when
+# there is no data (activity fallback timestamps are fixed at process start)
+UPDATES_FALLBACK: List[Update] = [
+    Update(title="New Cyber Insurance Requirements for 2025", label="Latest Update", description="Multi-factor authentication and endpoint detection are now standard.", date_str="Nov 10, 2024"),
+]
+_UPDATES_FALLBACK_BYTES = JSON_ENCODER.encode(UPDATES_FALLBACK)
+
+TEAM_FALLBACK: List[TeamMember] = [
+    TeamMember(name="Monique Reibelt", role="Senior Broker", email="monique@example.com", phone="+1 (555) 123-4567", linkedin="https://linkedin.com/in/moniquereibelt"),
+    TeamMember(name="Stuart Madden", role="Service Agent", email="stuart@example.com", phone="+1 (555) 987-6543", linkedin="https://linkedin.com/in/stuartmadden"),
+]
+_TEAM_FALLBACK_BYTES = JSON_ENCODER.encode(TEAM_FALLBACK)
+
+_ACTIVITIES_FALLBACK_BYTES = JSON_ENCODER.encode([
+    ActivityS(type="policy_renewal", message="Commercial Property Insurance renewed for another year", actor="system", occurred_at=datetime.utcnow()),
+    ActivityS(type="payment_made", message="Payment made", actor="John Smith", occurred_at=datetime.utcnow()),
+    ActivityS(type="document_uploaded", message="Document uploaded", actor="John Smith", occurred_at=datetime.utcnow()),
+])
+
 # Seed some demo data if collections are empty
 @app.on_event("startup")
 async def seed_demo():
-    try:
-        # Policies
-        if db and db["policy"].count_documents({}) == 0:
-            create_document("policy", Policy(policy_number="CP-12345", product="Commercial Property", start_date=datetime(2024,1,1), end_date=datetime(2024,12,31), premium=12000, insured_entity="Acme Corp", status="active"))
-            create_document("policy", Policy(policy_number="GL-67890", product="General Liability", start_date=datetime(2024,3,1), end_date=datetime(2025,2,28), premium=8500, insured_entity="Acme Corp", status="active"))
-            create_document("policy", Policy(policy_number="CY-22222", product="Cyber", start_date=datetime(2024,6,1), end_date=datetime(2025,5,31), premium=4000, insured_entity="Acme Corp", status="active"))
-        # Invoices
-        if db and db["invoice"].count_documents({}) == 0:
-            create_document("invoice", Invoice(invoice_number="INV-001", amount=15000, due_date=datetime(2025,11,15), status="outstanding"))
-            create_document("invoice", Invoice(invoice_number="INV-002", amount=9500, due_date=datetime(2025,11,20), status="outstanding"))
-        # Renewals
-        if db and db["renewal"].count_documents({}) == 0:
-            create_document("renewal", Renewal(policy_number="XX-0000", product="Directors & Officers", renewal_date=datetime(2026,2,1), status="not_required"))
+    if db is None:
+        return
+    now = datetime.utcnow()
+    # Seed literals are trusted, so build them without validation
+    seeds = {
+        "policy": [
+            Policy.model_construct(policy_number="CP-12345", product="Commercial Property", start_date=date(2024,1,1), end_date=date(2024,12,31), premium=12000, insured_entity="Acme Corp", status="active"),
+            Policy.model_construct(policy_number="GL-67890", product="General Liability", start_date=date(2024,3,1), end_date=date(2025,2,28), premium=8500, insured_entity="Acme Corp", status="active"),
+            Policy.model_construct(policy_number="CY-22222", product="Cyber", start_date=date(2024,6,1), end_date=date(2025,5,31), premium=4000, insured_entity="Acme Corp", status="active"),
+        ],
+        "invoice": [
+            Invoice.model_construct(invoice_number="INV-001", amount=15000, due_date=date(2025,11,15), status="outstanding"),
+            Invoice.model_construct(invoice_number="INV-002", amount=9500, due_date=date(2025,11,20), status="outstanding"),
+        ],
+        "renewal": [
+            Renewal.model_construct(policy_number="XX-0000", product="Directors & Officers", renewal_date=date(2026,2,1), status="not_required"),
+        ],
         # Risk Updates pending
-        if db and db["update"].count_documents({}) == 0:
-            create_document("update", Update(title="New Cyber Insurance Requirements for 2025", description="Multi-factor authentication and endpoint detection are now standard.", date_str="Nov 10, 2024"))
-        # Team members
-        if db and db["teammember"].count_documents({}) == 0:
-            create_document("teammember", TeamMember(name="Monique Reibelt", role="Senior Broker", email="monique@example.com", phone="+1 (555) 123-4567", linkedin="https://linkedin.com/in/moniquereibelt"))
-            create_document("teammember", TeamMember(name="Stuart Madden", role="Service Agent", email="stuart@example.com", phone="+1 (555) 987-6543", linkedin="https://linkedin.com/in/stuartmadden"))
-        # Activities
-        if db and db["activity"].count_documents({}) == 0:
-            create_document("activity", Activity(type="policy_renewal", message="Commercial Property Insurance renewed for another year", actor="system", occurred_at=datetime.utcnow()))
-            create_document("activity", Activity(type="payment_made", message="Payment of $10,000 recorded", actor="John Smith", occurred_at=datetime.utcnow() - timedelta(hours=6)))
-            create_document("activity", Activity(type="document_uploaded", message="Evidence.pdf uploaded", actor="John Smith", occurred_at=datetime.utcnow() - timedelta(days=1)))
+        "update": UPDATES_FALLBACK,
+        "teammember": TEAM_FALLBACK,
+        "activity": [
+            ActivityS(type="policy_renewal", message="Commercial Property Insurance renewed for another year", actor="system", occurred_at=now),
+            ActivityS(type="payment_made", message="Payment of $10,000 recorded", actor="John Smith", occurred_at=now - timedelta(hours=6)),
+            ActivityS(type="document_uploaded", message="Evidence.pdf uploaded", actor="John Smith", occurred_at=now - timedelta(days=1)),
+        ],
+    }
+    try:
+        # One insert_many per empty collection instead of one insert per document
+        for collection, items in seeds.items():
+            if await db[collection].count_documents({}) == 0:
+                await create_documents(collection, items)
     except Exception:
         pass
 
-# Notification bar endpoint
-@app.get("/api/notification", response_model=Notification)
-def get_notification():
-    return Notification(
-        title="Outstanding Invoices",
-        message="Outstanding Invoices: $24,500 – Payment due Nov 15 & Nov 20",
-        level="warning",
-    )
+# Date-only fields are stored as YYYY-MM-DD strings; convert any legacy datetimes once
+@app.on_event("startup")
+async def normalize_stored_dates():
+    if db is None:
+        return
+    try:
+        await migrate_date_fields()
+    except Exception:
+        logger.exception("Date field migration failed; legacy datetime values may break list endpoints")
+
+# Indexes backing the dashboard filters; {status, amount} covers the invoice totals
+INDEXES = {
+    "invoice": [[("status", 1), ("amount", 1)]],
+    "policy": [[("status", 1)]],
+    "renewal": [[("status", 1)]],
+}
+
+@app.on_event("startup")
+async def ensure_indexes():
+    if db is None:
+        return
+    try:
+        for collection, keys_list in INDEXES.items():
+            for keys in keys_list:
+                await db[collection].create_index(keys)
+    except Exception:
+        logger.exception("Index creation failed; dashboard queries will fall back to collection scans")
+
+# Notification bar endpoint (constant payload, serialized once at import)
+NOTIFICATION: Notification = {
+    "title": "Outstanding Invoices",
+    "message": "Outstanding Invoices: $24,500 – Payment due Nov 15 & Nov 20",
+    "level": "warning",
+}
+_NOTIFICATION_BYTES = JSON_ENCODER.encode(NOTIFICATION)
+
+@app.get("/api/notification", response_model=None)
+async def get_notification():
+    return Response(content=_NOTIFICATION_BYTES, media_type="application/json")
 
 # Dashboard counts
 class DashboardCounts(BaseModel):
@@ -70,14 +197,28 @@ class DashboardCounts(BaseModel):
     renewals_due: int
     risk_updates: int
 
+# Outstanding invoices are counted and summed server-side in one round-trip
+OUTSTANDING_INVOICES_PIPELINE = [
+    {"$match": {"status": "outstanding"}},
+    {"$group": {"_id": None, "count": {"$sum": 1}, "total": {"$sum": "$amount"}}},
+]
+
+async def outstanding_invoice_totals() -> Tuple[int, float]:
+    agg = await db["invoice"].aggregate(OUTSTANDING_INVOICES_PIPELINE).to_list(length=None)
+    return (agg[0]["count"], agg[0]["total"]) if agg else (0, 0)
+
 @app.get("/api/dashboard", response_model=DashboardCounts)
-def get_dashboard_counts():
-    active = db["policy"].count_documents({"status": "active"}) if db else 3
-    outstanding = list(db["invoice"].find({"status": "outstanding"})) if db else []
-    outstanding_count = len(outstanding) if outstanding else 2
-    outstanding_total = sum([i.get("amount", 0) for i in outstanding]) if outstanding else 24500
-    renewals_due = db["renewal"].count_documents({"status": "due"}) if db else 0
-    risk_updates = db["update"].count_documents({}) if db else 1
+@coalesce(window=DASHBOARD_COALESCE_WINDOW)
+async def get_dashboard_counts():
+    if db is None:
+        return DashboardCounts(active_policies=3, outstanding_invoices=2, outstanding_total=24500, renewals_due=0, risk_updates=1)
+    # The counts hit different collections, so run them concurrently
+    active, (outstanding_count, outstanding_total), renewals_due, risk_updates = await asyncio.gather(
+        db["policy"].count_documents({"status": "active"}),
+        outstanding_invoice_totals(),
+        db["renewal"].count_documents({"status": "due"}),
+        db["update"].count_documents({}),
+    )
     return DashboardCounts(
         active_policies=active,
         outstanding_invoices=outstanding_count,
@@ -87,19 +228,11 @@ def get_dashboard_counts():
     )
 
 # Policies list
-@app.get("/api/policies", response_model=List[Policy])
-def list_policies():
-    docs = get_documents("policy") if db else []
-    # Convert Mongo _id and timestamps
-    res: List[Policy] = []
-    for d in docs:
-        d.pop("_id", None)
-        # Convert dates if stored as datetime
-        for k in ["start_date", "end_date"]:
-            if isinstance(d.get(k), datetime):
-                d[k] = d[k].date()
-        res.append(Policy(**d))
-    return res
+@app.get("/api/policies", response_model=None)
+@ttl_cache(seconds=LIST_CACHE_TTL)
+async def list_policies():
+    docs = await get_documents("policy", projection=POLICY_PROJECTION) if db is not None else []
+    return policies_response(docs)
 
 # Documents upload and list
 @app.post("/api/documents/upload")
@@ -112,77 +245,65 @@ async def upload_document(file: UploadFile = File(...), policy_number: Optional[
         category="Uploaded",
         policy_number=policy_number,
     )
-    if db:
-        create_document("documentitem", item)
+    if db is not None:
+        await create_document("documentitem", item)
     return {"status": "ok", "filename": file.filename}
 
-@app.get("/api/documents", response_model=List[DocumentItem])
+@app.get("/api/documents", response_model=None)
 async def list_documents():
-    docs = get_documents("documentitem") if db else []
-    res: List[DocumentItem] = []
-    for d in docs:
-        d.pop("_id", None)
-        res.append(DocumentItem(**d))
-    return res
+    if db is None:
+        return Response(content=b"[]", media_type="application/json")
+    docs = iter_documents("documentitem", projection=DOCUMENT_PROJECTION)
+    return StreamingResponse(stream_json_array(docs, DocumentItemS), media_type="application/json")
 
 # Invoices endpoints
-@app.get("/api/invoices", response_model=List[Invoice])
-def list_invoices():
-    docs = get_documents("invoice") if db else []
-    for d in docs:
-        d.pop("_id", None)
-        if isinstance(d.get("due_date"), datetime):
-            d["due_date"] = d["due_date"].date()
-    return [Invoice(**d) for d in docs]
+@app.get("/api/invoices", response_model=None)
+async def list_invoices():
+    docs = await get_documents("invoice", projection=INVOICE_PROJECTION) if db is not None else []
+    return invoices_response(docs)
 
 # Renewals endpoints
-@app.get("/api/renewals", response_model=List[Renewal])
-def list_renewals():
-    docs = get_documents("renewal") if db else []
-    for d in docs:
-        d.pop("_id", None)
-        if isinstance(d.get("renewal_date"), datetime):
-            d["renewal_date"] = d["renewal_date"].date()
-    return [Renewal(**d) for d in docs]
+@app.get("/api/renewals", response_model=None)
+@ttl_cache(seconds=LIST_CACHE_TTL)
+async def list_renewals():
+    docs = await get_documents("renewal", projection=RENEWAL_PROJECTION) if db is not None else []
+    return renewals_response(docs)
 
 # Insurance updates/news
-@app.get("/api/updates", response_model=List[Update])
-def list_updates():
-    docs = get_documents("update") if db else []
-    for d in docs:
-        d.pop("_id", None)
+@app.get("/api/updates", response_model=None)
+@ttl_cache(seconds=LIST_CACHE_TTL)
+async def list_updates():
+    docs = await get_documents("update", projection=UPDATE_PROJECTION) if db is not None else []
     if not docs:
-        docs = [Update(title="New Cyber Insurance Requirements for 2025", description="Multi-factor authentication and endpoint detection are now standard.", date_str="Nov 10, 2024").model_dump()]
-    return [Update(**d) for d in docs]
+        return Response(content=_UPDATES_FALLBACK_BYTES, media_type="application/json")
+    return updates_response(docs)
 
 # Team members
-@app.get("/api/team", response_model=List[TeamMember])
-def list_team():
-    docs = get_documents("teammember") if db else []
-    for d in docs:
-        d.pop("_id", None)
+@app.get("/api/team", response_model=None)
+@ttl_cache(seconds=LIST_CACHE_TTL)
+async def list_team():
+    docs = await get_documents("teammember", projection=TEAM_PROJECTION) if db is not None else []
     if not docs:
-        docs = [
-            TeamMember(name="Monique Reibelt", role="Senior Broker", email="monique@example.com", phone="+1 (555) 123-4567", linkedin="https://linkedin.com/in/moniquereibelt").model_dump(),
-            TeamMember(name="Stuart Madden", role="Service Agent", email="stuart@example.com", phone="+1 (555) 987-6543", linkedin="https://linkedin.com/in/stuartmadden").model_dump(),
-        ]
-    return [TeamMember(**d) for d in docs]
+        return Response(content=_TEAM_FALLBACK_BYTES, media_type="application/json")
+    return team_response(docs)
+
+@app.post("/api/team")
+async def create_teammember(member: TeamMemberCreate):
+    if db is not None:
+        await create_document("teammember", member)
+        list_team.cache_clear()
+    return {"status": "ok", "name": member.name}
 
 # Activity feed
-@app.get("/api/activities", response_model=List[Activity])
-def list_activities():
-    docs = get_documents("activity") if db else []
-    for d in docs:
-        d.pop("_id", None)
-        if isinstance(d.get("occurred_at"), datetime):
-            d["occurred_at"] = d["occurred_at"].isoformat()
-    if not docs:
-        docs = [
-            Activity(type="policy_renewal", message="Commercial Property Insurance renewed for another year", actor="system", occurred_at=datetime.utcnow()).model_dump(),
-            Activity(type="payment_made", message="Payment made", actor="John Smith", occurred_at=datetime.utcnow()).model_dump(),
-            Activity(type="document_uploaded", message="Document uploaded", actor="John Smith", occurred_at=datetime.utcnow()).model_dump(),
-        ]
-    return [Activity(**d) for d in docs]
+@app.get("/api/activities", response_model=None)
+async def list_activities():
+    if db is None:
+        return Response(content=_ACTIVITIES_FALLBACK_BYTES, media_type="application/json")
+    docs = iter_documents("activity", projection=ACTIVITY_PROJECTION)
+    first = await anext(docs, None)
+    if first is None:
+        return Response(content=_ACTIVITIES_FALLBACK_BYTES, media_type="application/json")
+    return StreamingResponse(stream_json_array(docs, ActivityS, first), media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
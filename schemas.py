@@ -2,14 +2,21 @@
 Database Schemas for Insurance Portal
 
 Each Pydantic model represents a MongoDB collection. Collection name is the
-lowercase of the class name (e.g., Policy -> "policy").
+lowercase of the class name (e.g., Policy -> "policy"). Simple record types
+(Notification, Update, TeamMember) are TypedDicts and follow the same naming.
 """
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 from typing import Optional, List, Literal
+from typing_extensions import TypedDict, NotRequired
 from datetime import date, datetime
 
+# Stored records are never mutated after construction; unknown keys are dropped
+RECORD_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
 # Core domain models
 class Policy(BaseModel):
+    model_config = RECORD_CONFIG
+
     policy_number: str = Field(..., description="Unique policy number")
     product: str = Field(..., description="Product name, e.g., Commercial Property")
     status: Literal["active", "expired", "cancelled"] = "active"
@@ -19,6 +26,8 @@ class Policy(BaseModel):
     insured_entity: str
 
 class DocumentItem(BaseModel):
+    model_config = RECORD_CONFIG
+
     filename: str
     content_type: Optional[str] = None
     size_bytes: Optional[int] = Field(None, ge=0)
@@ -26,6 +35,8 @@ class DocumentItem(BaseModel):
     policy_number: Optional[str] = None
 
 class Invoice(BaseModel):
+    model_config = RECORD_CONFIG
+
     invoice_number: str
     amount: float = Field(..., ge=0)
     due_date: date
@@ -33,29 +44,42 @@ class Invoice(BaseModel):
     policy_number: Optional[str] = None
 
 class Renewal(BaseModel):
+    model_config = RECORD_CONFIG
+
     policy_number: str
     product: str
     renewal_date: date
     status: Literal["due", "submitted", "not_required"] = "due"
 
 class Activity(BaseModel):
+    model_config = RECORD_CONFIG
+
     type: str = Field(..., description="Action type, e.g., policy_renewal, payment_made, document_uploaded")
     message: str
     actor: Optional[str] = "system"
     occurred_at: Optional[datetime] = None
 
-class Notification(BaseModel):
+# Internal record types: plain dicts, no per-instance validation
+class Notification(TypedDict):
     title: str
     message: str
-    level: Literal["info", "warning", "critical"] = "info"
+    level: Literal["info", "warning", "critical"]
 
-class Update(BaseModel):
+class Update(TypedDict):
     title: str
-    label: Optional[str] = "Latest Update"
-    description: Optional[str] = None
+    label: NotRequired[Optional[str]]
+    description: NotRequired[Optional[str]]
     date_str: str
 
-class TeamMember(BaseModel):
+class TeamMember(TypedDict):
+    name: str
+    role: str
+    email: str
+    phone: str
+    linkedin: NotRequired[Optional[str]]
+
+# Request bodies: validated once on write so reads can trust stored data
+class TeamMemberCreate(BaseModel):
     name: str
     role: str
     email: EmailStr
@@ -0,0 +1,61 @@
+"""
+msgspec mirrors of the API schemas
+
+Lightweight Struct versions of the models in schemas.py, used on hot paths
+to build, shape and encode Mongo documents without going through Pydantic.
+Keep the fields in sync with schemas.py.
+"""
+import msgspec
+from typing import Optional, Literal, Annotated
+from datetime import date, datetime
+
+NonNegativeFloat = Annotated[float, msgspec.Meta(ge=0)]
+NonNegativeInt = Annotated[int, msgspec.Meta(ge=0)]
+
+class PolicyS(msgspec.Struct, kw_only=True):
+    policy_number: str
+    product: str
+    status: Literal["active", "expired", "cancelled"] = "active"
+    start_date: date
+    end_date: date
+    premium: NonNegativeFloat
+    insured_entity: str
+
+class DocumentItemS(msgspec.Struct, kw_only=True):
+    filename: str
+    content_type: Optional[str] = None
+    size_bytes: Optional[NonNegativeInt] = None
+    category: Optional[str] = None
+    policy_number: Optional[str] = None
+
+class InvoiceS(msgspec.Struct, kw_only=True):
+    invoice_number: str
+    amount: NonNegativeFloat
+    due_date: date
+    status: Literal["outstanding", "paid"] = "outstanding"
+    policy_number: Optional[str] = None
+
+class RenewalS(msgspec.Struct, kw_only=True):
+    policy_number: str
+    product: str
+    renewal_date: date
+    status: Literal["due", "submitted", "not_required"] = "due"
+
+class ActivityS(msgspec.Struct, frozen=True, kw_only=True):
+    type: str
+    message: str
+    actor: Optional[str] = "system"
+    occurred_at: Optional[datetime] = None
+
+class UpdateS(msgspec.Struct, kw_only=True):
+    title: str
+    label: Optional[str] = "Latest Update"
+    description: Optional[str] = None
+    date_str: str
+
+class TeamMemberS(msgspec.Struct, kw_only=True):
+    name: str
+    role: str
+    email: str
+    phone: str
+    linkedin: Optional[str] = None
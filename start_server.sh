@@ -14,6 +14,8 @@ fi
 mkdir -p logs
 echo "Installing dependencies..."
 pip install -r requirements.txt
+# Allowed CORS origins for the frontend; set FRONTEND_ORIGIN to the real origin(s)
+export FRONTEND_ORIGIN="${FRONTEND_ORIGIN:-*}"
 echo "Starting FastAPI server..."
 nohup uvicorn main:app --host 0.0.0.0 --port 8000 --reload > logs/server.log 2>&1 
 echo "Server started in background"